@@ -1,53 +1,237 @@
 import pandas as pd
+import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from urllib.parse import parse_qs, urlparse
-import time
+from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from collections import OrderedDict, deque, namedtuple
+import queue
+import atexit
+import csv
+import fnmatch
+import hashlib
+import itertools
 import json
+import os
 import re
+import shelve
+import shutil
+import tempfile
+import threading
+import time
 from datetime import datetime
 
-class YouTubeScraper:
-    def __init__(self, use_edge=True):
-        """Initialize YouTube scraper with specified browser"""
-        # Set up browser options
-        if use_edge:
-            options = EdgeOptions()
+try:
+    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:  # Playwright is optional, only needed for YouTubeScraperPW
+    sync_playwright = None
+    PlaywrightTimeoutError = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+INNERTUBE_NEXT_URL = "https://www.youtube.com/youtubei/v1/next"
+INNERTUBE_PLAYER_URL = "https://www.youtube.com/youtubei/v1/player"
+INNERTUBE_CLIENT_VERSION = "2.20240101.00.00"
+BLOCKED_URLS = [
+    "*doubleclick.net*",
+    "*googlesyndication*",
+    "*googlevideo.com/videoplayback*",
+    "*i.ytimg.com*",
+    "*fonts.gstatic*",
+    "*youtube.com/api/stats*"
+]
+MAX_BATCH_WORKERS = 4  # Stay under YouTube's rate limiter
+VIDEO_INFO_CACHE = '.yt_info_cache'
+VIDEO_INFO_MEMORY_SIZE = 128  # Video info lookups kept in memory per scraper
+VIDEO_INFO_TTL = 24 * 60 * 60  # Seconds before cached views/likes are refetched
+PROFILE_DIR = os.path.expanduser("~/.yt_scraper_profile")  # Warm browser cache between runs
+STREAM_BUFFER_SIZE = 100  # Recent comments kept in memory while streaming
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# CSS selectors, these use the browser's native selector engine unlike XPath text predicates
+COOKIE_BUTTON_SELECTOR = 'tp-yt-paper-dialog button'
+COOKIE_ACCEPT_WORDS = ["accept", "agree"]
+NEWEST_SORT_SELECTOR = 'tp-yt-paper-listbox a[aria-label*="Newest"]'
+
+# Compact comment record, only converted to a dict when serializing to JSON
+Comment = namedtuple('Comment', 'author text likes timestamp')
+
+# In-page scripts shared by the Selenium and Playwright scrapers
+# (the batch extract returns rows in Comment field order)
+JS_BATCH_EXTRACT = """(start) => Array.from(document.querySelectorAll('ytd-comment-thread-renderer'))
+    .slice(start)
+    .map(el => [
+        el.querySelector('#author-text')?.innerText.trim() || '',
+        el.querySelector('#content-text')?.innerText.trim() || '',
+        el.querySelector('#vote-count-middle')?.innerText.trim() || '0',
+        el.querySelector('.published-time-text')?.innerText.trim() || 'Unknown'
+    ])"""
+JS_INSTALL_OBSERVER = """() => {
+    const contents = document.querySelector('#contents.ytd-item-section-renderer');
+    if (!contents) return false;
+    window.__ytNewComments = 0;
+    new MutationObserver(m => window.__ytNewComments += m.filter(x => x.addedNodes.length).length)
+        .observe(contents, {childList: true, subtree: false});
+    return true;
+}"""
+JS_TAKE_NEW_COMMENTS = "() => { const n = window.__ytNewComments; window.__ytNewComments = 0; return n; }"
+
+_profile_locks = {}  # Profile directories this process holds, kept open until exit
+
+def _lock_profile(profile_path):
+    """Take an exclusive lock on a profile directory, returning False if another process uses it"""
+    if profile_path in _profile_locks:
+        return True
+    
+    os.makedirs(profile_path, exist_ok=True)
+    lock_file = open(profile_path + ".lock", "a+")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
         else:
-            options = ChromeOptions()
-            
-        # Configure browser options
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--start-maximized')
-        options.add_argument('--disable-notifications')
-        options.add_argument('--mute-audio')
-        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        # Initialize driver
-        self.driver = webdriver.Edge(options=options) if use_edge else webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 15)
-        
-        # Hide automation
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        print(f"Started {'Edge' if use_edge else 'Chrome'} browser")
-    
-    def extract_video_id(self, url):
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    # The OS releases the lock when the process exits, even after a crash
+    _profile_locks[profile_path] = lock_file
+    return True
+
+def _profile_dir(profile_name):
+    """Get the persistent profile directory, or a temporary one if another run holds it"""
+    profile_path = os.path.join(PROFILE_DIR, profile_name)
+    if _lock_profile(profile_path):
+        return profile_path
+    
+    temp_path = tempfile.mkdtemp(prefix="yt_scraper_profile_")
+    atexit.register(shutil.rmtree, temp_path, ignore_errors=True)
+    print(f"Profile {profile_path} is in use by another run, using a temporary profile")
+    return temp_path
+
+def create_driver(use_edge=True, profile_slot=None):
+    """Start a configured Edge or Chrome WebDriver"""
+    # Set up browser options
+    if use_edge:
+        options = EdgeOptions()
+    else:
+        options = ChromeOptions()
+        
+    # Configure browser options
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1280,4000')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--mute-audio')
+    options.add_argument(f'user-agent={USER_AGENT}')
+    
+    # Reuse a persistent profile so cached YouTube assets survive between runs,
+    # each slot gets its own directory since only one browser can hold a profile
+    profile_name = "edge" if use_edge else "chrome"
+    if profile_slot is not None:
+        profile_name += f"_{profile_slot}"
+    options.add_argument(f'--user-data-dir={_profile_dir(profile_name)}')
+    options.add_argument('--profile-directory=Default')
+    
+    # Block images and autoplay, we only need the page text
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.autoplay": 2
+    })
+    
+    # Initialize driver, Selenium 4 keeps the connection to the driver server alive by default
+    driver = webdriver.Edge(options=options) if use_edge else webdriver.Chrome(options=options)
+    
+    # Drop ads, media and telemetry requests, keep the page HTML and comment XHRs
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    
+    # Hide automation
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    print(f"Started {'Edge' if use_edge else 'Chrome'} browser")
+    return driver
+
+_ID_RE = re.compile(r'[A-Za-z0-9_-]{11}')
+_URL_RE = re.compile(r'(?:youtu\.be/|youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/))([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])')
+_BLOCKED_URL_RE = re.compile("|".join(fnmatch.translate(pattern) for pattern in BLOCKED_URLS))
+_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+_info_cache_lock = threading.Lock()
+
+class CommentStream:
+    def __init__(self, filename, buffer_size=STREAM_BUFFER_SIZE):
+        """Write comments to an NDJSON file as they are scraped, keeping only the latest in memory"""
+        self.filename = filename
+        self.recent = deque(maxlen=buffer_size)
+        self.count = 0
+        self._file = open(filename, 'w', encoding='utf-8')
+    
+    def extend(self, comments):
+        """Write comments to the file, one JSON object per line"""
+        for comment in comments:
+            self._file.write(json.dumps(comment._asdict(), ensure_ascii=False) + '\n')
+            self.recent.append(comment)
+            self.count += 1
+    
+    def __len__(self):
+        return self.count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        # Close without a trailer if scraping failed before the result was built
+        self.close()
+    
+    def close(self, trailer=None):
+        """Write the optional trailing record and close the file"""
+        if self._file.closed:
+            return
+        if trailer:
+            self._file.write(json.dumps(trailer, ensure_ascii=False) + '\n')
+        self._file.close()
+        print(f"Comments streamed to: {self.filename}")
+
+def create_session():
+    """Create an HTTP session for InnerTube API calls (keep-alive + gzip)"""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": "gzip, deflate",
+        "Accept-Language": "en-US,en;q=0.9"
+    })
+    return session
+
+class YouTubeScraper:
+    def __init__(self, use_edge=True, driver=None):
+        """Initialize YouTube scraper with specified browser or an existing driver"""
+        self._init_state(driver or create_driver(use_edge))
+    
+    def _init_state(self, driver=None):
+        """Set up the state shared by all scrapers, driver is None for non-Selenium browsers"""
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 15) if driver else None
+        self.session = create_session()
+        self._video_info_cache = OrderedDict()  # LRU, bounded by VIDEO_INFO_MEMORY_SIZE
+        self._loaded_video_id = None
+    
+    @staticmethod
+    def extract_video_id(url):
         """Extract YouTube video ID from URL"""
-        if 'youtu.be' in url:
-            return url.split('/')[-1].split('?')[0]
-        elif 'youtube.com/watch' in url:
-            parsed_url = urlparse(url)
-            return parse_qs(parsed_url.query).get('v', [None])[0]
-        elif 'youtube.com/shorts' in url or 'youtube.com/embed' in url:
-            return url.split('/')[-1].split('?')[0]
-        elif re.match(r'^[A-Za-z0-9_-]{11}$', url):  # Just the ID
-            return url
-        return None
+        match = _URL_RE.search(url)
+        return match.group(1) if match else (url if _ID_RE.fullmatch(url) else None)
     
     def get_video_info(self, video_url):
         """Get basic information about the video"""
@@ -55,21 +239,99 @@ class YouTubeScraper:
         if not video_id:
             print("Invalid YouTube URL")
             return None
+        return self._get_video_info_cached(video_id)
+    
+    def _get_video_info_cached(self, video_id):
+        """Get video info from the in-memory or on-disk cache, scraping it on a miss"""
+        if video_id in self._video_info_cache:
+            self._video_info_cache.move_to_end(video_id)
+            return self._video_info_cache[video_id]
+        
+        with _info_cache_lock, shelve.open(VIDEO_INFO_CACHE) as cache:
+            entry = cache.get(video_id)
+        
+        # Entries expire so views and likes don't stay frozen at the first lookup
+        if (isinstance(entry, dict) and time.time() - entry.get("fetched_at", 0) < VIDEO_INFO_TTL
+                and "likes" in entry.get("video_info", {})):
+            video_info = entry["video_info"]
+            print(f"Video info loaded from cache: '{video_info['title']}' by {video_info['channel']}")
+        else:
+            # The player API avoids a page load, fall back to the DOM if it fails
+            video_info = self._get_video_info_api(video_id) or self._scrape_video_info(video_id)
+            # Only cache complete lookups so a bad page load gets retried next time
+            if video_info["title"] in ("", "Unknown Title"):
+                return video_info
             
+            with _info_cache_lock, shelve.open(VIDEO_INFO_CACHE) as cache:
+                cache[video_id] = {"fetched_at": time.time(), "video_info": video_info}
+        
+        self._video_info_cache[video_id] = video_info
+        if len(self._video_info_cache) > VIDEO_INFO_MEMORY_SIZE:
+            self._video_info_cache.popitem(last=False)
+        return video_info
+    
+    def _get_video_info_api(self, video_id):
+        """Get video info from the InnerTube player endpoint, or None on failure"""
+        context = {"client": {"clientName": "WEB", "clientVersion": INNERTUBE_CLIENT_VERSION, "hl": "en"}}
+        try:
+            response = self.session.post(INNERTUBE_PLAYER_URL, json={"context": context, "videoId": video_id},
+                                         timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            details = data["videoDetails"]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"InnerTube player API failed ({e}), reading video info from the page")
+            return None
+        
+        microformat = data.get("microformat", {}).get("playerMicroformatRenderer", {})
+        view_count = details.get("viewCount", "")
+        publish_date = microformat.get("publishDate") or microformat.get("uploadDate") or ""
+        video_info = {
+            "video_id": video_id,
+            "title": details.get("title") or "Unknown Title",
+            "channel": details.get("author") or "Unknown Channel",
+            "views": f"{int(view_count):,} views" if view_count.isdigit() else "Unknown Views",
+            "upload_date": self._format_upload_date(publish_date),
+            "likes": None,  # Not part of the player response, saved as null rather than a fake value
+            "url": f"https://www.youtube.com/watch?v={video_id}"
+        }
+        
+        print(f"Video info extracted: '{video_info['title']}' by {video_info['channel']}")
+        print("Like count is not available from the player API, likes saved as null")
+        return video_info
+    
+    def _format_upload_date(self, iso_date):
+        """Format an ISO date like the page shows it ("Mar 8, 2025") so both info sources match"""
+        try:
+            date = datetime.fromisoformat(iso_date[:10])
+        except ValueError:
+            return "Unknown Date"
+        return f"{date:%b} {date.day}, {date.year}"
+    
+    def _load_video_page(self, video_id):
+        """Navigate to the video page and dismiss the cookie consent"""
         # Navigate to video
         url = f"https://www.youtube.com/watch?v={video_id}"
         self.driver.get(url)
-        time.sleep(3)
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1 yt-formatted-string")))
+        except TimeoutException:
+            print("Timed out waiting for video page to load")
         
         # Handle cookie consent if it appears
-        cookie_buttons = self.driver.find_elements(By.XPATH, 
-            "//button[contains(., 'Accept') or contains(., 'I agree')]")
+        cookie_buttons = self.driver.find_elements(By.CSS_SELECTOR, COOKIE_BUTTON_SELECTOR)
         for button in cookie_buttons:
-            if "accept" in button.text.lower() or "agree" in button.text.lower():
+            if any(word in button.text.lower() for word in COOKIE_ACCEPT_WORDS):
                 button.click()
-                time.sleep(1)
                 break
         
+        self._loaded_video_id = video_id
+        return url
+    
+    def _scrape_video_info(self, video_id):
+        """Load the video page and read its info from the DOM"""
+        url = self._load_video_page(video_id)
+        
         # Extract video info using simpler selectors
         video_info = {
             "video_id": video_id,
@@ -89,85 +351,266 @@ class YouTubeScraper:
         elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
         return elements[0].text if elements else default
     
-    def scrape_comments(self, video_url, max_comments=None, sort_by="top"):
-        """Scrape comments from a YouTube video with strict comment limit"""
+    def scrape_comments(self, video_url, max_comments=None, sort_by="top", stream_to=None):
+        """Scrape comments from a YouTube video with strict comment limit, optionally streaming to NDJSON"""
         # Get video info
         video_info = self.get_video_info(video_url)
         if not video_info:
             return None
         
+        # Cached video info skips the page load, so make sure the video is open
+        if self._loaded_video_id != video_info["video_id"]:
+            self._load_video_page(video_info["video_id"])
+        
         # Scroll to comments section
         print("Scrolling to comments section...")
-        self.driver.execute_script("window.scrollTo(0, document.querySelector('#comments').offsetTop);")
-        time.sleep(2)
+        self._scroll_to_comments()
+        self._wait_for_comment_count(0, timeout=5)
         
         # Sort comments if needed
         if sort_by.lower() == "newest":
             self._sort_comments_by_newest()
         
-        # Collection variables
-        comments = []
-        last_comment_count = 0
-        consecutive_unchanged = 0
-        scroll_count = 0
+        # Watch the comment list so scrolling can wait on actual DOM changes
+        observing = self._install_comment_observer()
         
+        # Collect comments, stopping the scroll loop as soon as we have enough
         print(f"Starting to collect comments (max: {max_comments if max_comments else 'all'})...")
+        with CommentStream(stream_to) if stream_to else nullcontext([]) as comments:
+            comments.extend(itertools.islice(self._scroll_comments(observing), max_comments or None))
+            if max_comments and len(comments) >= max_comments:
+                print(f"Reached maximum comment limit ({max_comments})")
+            
+            return self._build_result(video_info, comments, sort_by)
+    
+    def _scroll_comments(self, observing):
+        """Yield new comments while scrolling down the comment section"""
+        seen = set()
+        rendered_count = 0
+        consecutive_unchanged = 0
+        scroll_count = 0
         
         # Main scraping loop
-        while (not max_comments or len(comments) < max_comments) and scroll_count < 30 and consecutive_unchanged < 3:
-            # Get current comments
-            comment_elements = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-thread-renderer")
+        while scroll_count < 30 and consecutive_unchanged < 3:
+            # Extract only the threads rendered since the last pass in a single script call
+            batch = self._extract_all_comments_js(rendered_count)
+            rendered_count += len(batch)
+            
+            # Only keep comments with meaningful content that we haven't seen yet, YouTube
+            # may re-render threads so DOM position alone can't rule out duplicates
+            batch = [c for c in batch if c.author and c.text
+                     and (key := self._comment_key(c)) not in seen and not seen.add(key)]
             
             # Track if we've found new comments
-            if len(comment_elements) > last_comment_count:
-                print(f"Found {len(comment_elements)} comments so far")
-                last_comment_count = len(comment_elements)
+            if batch:
+                print(f"Found {len(seen)} comments so far")
                 consecutive_unchanged = 0
             else:
                 consecutive_unchanged += 1
             
-            # Process only new comments we haven't seen yet
-            start_index = len(comments)
-            end_index = min(len(comment_elements), 
-                          len(comments) + 10,  
-                          (max_comments or float('inf')))
-            
-            for i in range(start_index, end_index):
-                comment_data = self._extract_comment(comment_elements[i])
-                if comment_data:
-                    comments.append(comment_data)
-                    # Stop if we've reached the limit
-                    if max_comments and len(comments) >= max_comments:
-                        break
-            
-            # Print progress periodically
-            if len(comments) % 10 == 0 and len(comments) > 0:
-                print(f"Extracted {len(comments)} comments")
+            yield from batch
             
-            # Break if we've hit our limit
-            if max_comments and len(comments) >= max_comments:
-                print(f"Reached maximum comment limit ({max_comments})")
-                break
-                
             # Scroll to load more comments
-            self.driver.execute_script("window.scrollBy(0, 800);")
-            time.sleep(2)
+            self._scroll_down()
+            if observing:
+                self._wait_for_new_comments()
+            else:
+                self._wait_for_comment_count(rendered_count)
             scroll_count += 1
+    
+    def _comment_key(self, comment):
+        """Compact digest identifying a comment, so the seen set doesn't hold every comment's text"""
+        raw = "\0".join((comment.author, comment.timestamp, comment.text)).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+    
+    def _scroll_to_comments(self):
+        """Scroll the page to the top of the comments section"""
+        self.driver.execute_script("window.scrollTo(0, document.querySelector('#comments').offsetTop);")
+    
+    def _scroll_down(self):
+        """Scroll down two viewports to trigger loading more comments"""
+        self.driver.execute_script("window.scrollBy(0, document.documentElement.clientHeight * 2);")
+    
+    def _wait_for_comment_count(self, last_count, timeout=3):
+        """Wait until more than last_count comments are rendered or the timeout elapses"""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, "ytd-comment-thread-renderer")) > last_count)
+            return True
+        except TimeoutException:
+            return False
+    
+    def scrape_comments_api(self, video_url, max_comments=None, sort_by="top", stream_to=None):
+        """Scrape comments through YouTube's InnerTube API, falling back to the browser on failure"""
+        video_id = self.extract_video_id(video_url)
+        if not video_id:
+            print("Invalid YouTube URL")
+            return None
+        
+        print(f"Collecting comments via InnerTube API (max: {max_comments if max_comments else 'all'})...")
+        with CommentStream(stream_to) if stream_to else nullcontext([]) as comments:
+            try:
+                comments.extend(itertools.islice(self._fetch_comments_api(video_id, sort_by), max_comments or None))
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                error = e
+            else:
+                # Get video info
+                video_info = self.get_video_info(video_url)
+                return self._build_result(video_info, comments, sort_by)
         
-        # Create final result object
+        # The stream is closed at this point, so the browser scrape can reopen the file
+        print(f"InnerTube API failed ({error}), falling back to browser scraping")
+        return self.scrape_comments(video_url, max_comments, sort_by, stream_to)
+    
+    def _build_result(self, video_info, comments, sort_by):
+        """Create the final result object, closing the comment stream if there is one"""
         result = {
             "video_info": video_info,
-            "comments": comments[:max_comments] if max_comments else comments,  # Ensure we don't exceed max
+            "comments": comments,
             "metadata": {
-                "total_comments_collected": min(len(comments), max_comments if max_comments else len(comments)),
+                "total_comments_collected": len(comments),
                 "sort_order": sort_by,
                 "scrape_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
         }
         
-        print(f"Successfully scraped {len(result['comments'])} comments")
+        if isinstance(comments, CommentStream):
+            # Full comments live in the file, the trailing line carries the metadata
+            comments.close({"video_info": video_info, "metadata": result["metadata"]})
+            result["comments"] = list(comments.recent)
+            result["metadata"]["streamed_to"] = comments.filename
+        
+        print(f"Successfully scraped {result['metadata']['total_comments_collected']} comments")
         return result
     
+    def _fetch_comments_api(self, video_id, sort_by="top"):
+        """Yield comments while paging through continuations of the InnerTube next endpoint"""
+        response = self.session.get(f"https://www.youtube.com/watch?v={video_id}", timeout=15)
+        response.raise_for_status()
+        html = response.text
+        
+        # Pull API config and initial page data out of the watch page
+        api_key = re.search(r'"INNERTUBE_API_KEY":"([^"]+)"', html)
+        client_version = re.search(r'"INNERTUBE_CLIENT_VERSION":"([^"]+)"', html)
+        initial_data = re.search(r'var ytInitialData = ({.*?});</script>', html, re.DOTALL)
+        if not initial_data:
+            raise ValueError("ytInitialData not found")
+        
+        token = self._find_comments_token(json.loads(initial_data.group(1)))
+        if not token:
+            raise ValueError("comments continuation token not found")
+        
+        params = {"key": api_key.group(1)} if api_key else None
+        context = {"client": {
+            "clientName": "WEB",
+            "clientVersion": client_version.group(1) if client_version else INNERTUBE_CLIENT_VERSION,
+            "hl": "en"
+        }}
+        
+        collected = 0
+        needs_sort = sort_by.lower() == "newest"
+        while token:
+            response = self.session.post(INNERTUBE_NEXT_URL, params=params,
+                                         json={"context": context, "continuation": token}, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            
+            # Newer responses keep comment content in entity mutations keyed by comment id
+            entities = {}
+            for mutation in data.get("frameworkUpdates", {}).get("entityBatchUpdate", {}).get("mutations", []):
+                payload = mutation.get("payload", {}).get("commentEntityPayload")
+                if payload:
+                    entities[mutation["entityKey"]] = payload
+            
+            token = None
+            batch = []
+            sort_changed = False
+            for endpoint in data.get("onResponseReceivedEndpoints", []):
+                action = endpoint.get("reloadContinuationItemsCommand") or endpoint.get("appendContinuationItemsAction") or {}
+                for item in action.get("continuationItems", []):
+                    if needs_sort and "commentsHeaderRenderer" in item:
+                        # Restart from the "Newest first" continuation of the sort menu
+                        menu = item["commentsHeaderRenderer"]["sortMenu"]["sortFilterSubMenuRenderer"]
+                        menu_items = menu.get("subMenuItems", [])
+                        if len(menu_items) < 2:
+                            raise ValueError("comment sort menu has no 'Newest first' entry")
+                        token = menu_items[1]["serviceEndpoint"]["continuationCommand"]["token"]
+                        needs_sort = False
+                        sort_changed = True
+                        print("Changed sort order to: Newest first")
+                        break
+                    elif "commentThreadRenderer" in item:
+                        comment = self._parse_comment_thread(item["commentThreadRenderer"], entities)
+                        if comment.author and comment.text:
+                            batch.append(comment)
+                    elif "continuationItemRenderer" in item:
+                        token = item["continuationItemRenderer"].get("continuationEndpoint", {}) \
+                            .get("continuationCommand", {}).get("token")
+                if sort_changed:
+                    break
+            
+            if batch:
+                collected += len(batch)
+                print(f"Fetched {collected} comments")
+            yield from batch
+    
+    def _find_comments_token(self, initial_data):
+        """Find the continuation token of the comment section in ytInitialData"""
+        sections = initial_data.get("contents", {}).get("twoColumnWatchNextResults", {}) \
+            .get("results", {}).get("results", {}).get("contents", [])
+        for section in sections:
+            renderer = section.get("itemSectionRenderer", {})
+            if renderer.get("sectionIdentifier") != "comment-item-section":
+                continue
+            for item in renderer.get("contents", []):
+                token = item.get("continuationItemRenderer", {}).get("continuationEndpoint", {}) \
+                    .get("continuationCommand", {}).get("token")
+                if token:
+                    return token
+        return None
+    
+    def _parse_comment_thread(self, thread, entities):
+        """Extract comment data from an InnerTube commentThreadRenderer"""
+        if "comment" in thread:
+            renderer = thread["comment"]["commentRenderer"]
+            return Comment(
+                author=self._runs_text(renderer.get("authorText")),
+                text=self._runs_text(renderer.get("contentText")),
+                likes=self._runs_text(renderer.get("voteCount")) or "0",
+                timestamp=self._runs_text(renderer.get("publishedTimeText")) or "Unknown"
+            )
+        
+        key = thread.get("commentViewModel", {}).get("commentViewModel", {}).get("commentKey")
+        payload = entities.get(key, {})
+        properties = payload.get("properties", {})
+        return Comment(
+            author=payload.get("author", {}).get("displayName", "").strip(),
+            text=properties.get("content", {}).get("content", "").strip(),
+            likes=payload.get("toolbar", {}).get("likeCountNotliked", "").strip() or "0",
+            timestamp=properties.get("publishedTime", "").strip() or "Unknown"
+        )
+    
+    def _runs_text(self, obj):
+        """Join InnerTube simpleText/runs text objects into a plain string"""
+        if not obj:
+            return ""
+        if "simpleText" in obj:
+            return obj["simpleText"].strip()
+        return "".join(run.get("text", "") for run in obj.get("runs", [])).strip()
+    
+    def _install_comment_observer(self):
+        """Count comment list mutations in the page so new loads can be detected"""
+        return self.driver.execute_script(f"return ({JS_INSTALL_OBSERVER})();")
+    
+    def _wait_for_new_comments(self, timeout=4):
+        """Wait until the comment observer reports newly added comments or the timeout elapses"""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script(f"return ({JS_TAKE_NEW_COMMENTS})();") > 0)
+            return True
+        except TimeoutException:
+            return False
+    
     def _sort_comments_by_newest(self):
         """Sort YouTube comments by newest first"""
         # Try to click sort button and select "Newest first"
@@ -177,47 +620,46 @@ class YouTubeScraper:
             return
             
         sort_button[0].click()
-        time.sleep(1)
-        
-        newest_options = self.driver.find_elements(By.XPATH, "//paper-item[contains(., 'Newest first')]")
-        if newest_options:
-            newest_options[0].click()
-            time.sleep(2)
-            print("Changed sort order to: Newest first")
-    
-    def _extract_comment(self, comment_element):
-        """Extract data from a comment element"""
-        author = self._get_element_text(comment_element, "#author-text")
-        text = self._get_element_text(comment_element, "#content-text")
-        likes = self._get_element_text(comment_element, "#vote-count-middle") or "0"
-        timestamp = self._get_element_text(comment_element, ".published-time-text") or "Unknown"
-        
-        # Only return if we have meaningful content
-        if author and text:
-            return {
-                "author": author,
-                "text": text,
-                "likes": likes,
-                "timestamp": timestamp
-            }
-        return None
+        
+        try:
+            newest_option = self.wait.until(EC.element_to_be_clickable(
+                (By.CSS_SELECTOR, NEWEST_SORT_SELECTOR)))
+        except TimeoutException:
+            return
+        
+        # Remember a current comment so we can tell when the list re-renders
+        old_comments = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-thread-renderer")
+        newest_option.click()
+        if old_comments:
+            try:
+                self.wait.until(EC.staleness_of(old_comments[0]))
+            except TimeoutException:
+                pass
+        print("Changed sort order to: Newest first")
     
-    def _get_element_text(self, parent, selector):
-        """Get text from a child element using CSS selector"""
-        elements = parent.find_elements(By.CSS_SELECTOR, selector)
-        return elements[0].text.strip() if elements else ""
+    def _extract_all_comments_js(self, last_seen_count):
+        """Extract data from all comment elements past last_seen_count in one script call"""
+        batch = self.driver.execute_script(f"return ({JS_BATCH_EXTRACT})(arguments[0]);", last_seen_count)
+        return [Comment._make(row) for row in batch or []]
     
     def save_to_json(self, data, filename):
         """Save data to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        data = {**data, "comments": [comment._asdict() for comment in data["comments"]]}
+        if orjson:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         print(f"Data saved to: {filename}")
         
     def save_to_csv(self, data, filename):
         """Save comments to CSV file"""
         if data and "comments" in data and data["comments"]:
-            df = pd.DataFrame(data["comments"])
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(Comment._fields)
+                writer.writerows(data["comments"])
             print(f"Comments saved to: {filename}")
             
     def close(self):
@@ -226,43 +668,321 @@ class YouTubeScraper:
             self.driver.quit()
             print("Browser closed")
 
+class YouTubeScraperPW(YouTubeScraper):
+    def __init__(self, headless=True):
+        """Initialize YouTube scraper on Playwright, talking CDP over a single WebSocket"""
+        if sync_playwright is None:
+            raise ImportError("Playwright is not installed, run: pip install playwright && playwright install chromium")
+        
+        self._playwright = sync_playwright().start()
+        self.browser = self._playwright.chromium.launch(headless=headless, args=[
+            '--disable-blink-features=AutomationControlled',
+            '--autoplay-policy=user-gesture-required',
+            '--mute-audio'
+        ])
+        self.page = self.browser.new_page(user_agent=USER_AGENT, viewport={"width": 1280, "height": 4000})
+        
+        # Drop the same media, ad and telemetry traffic the Selenium scraper blocks
+        self.page.route("**/*", self._route_request)
+        
+        self._init_state()
+        print("Started Playwright Chromium browser")
+    
+    def _route_request(self, route):
+        """Abort images, media, fonts and BLOCKED_URLS requests, let everything else through"""
+        request = route.request
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or _BLOCKED_URL_RE.match(request.url):
+            route.abort()
+        else:
+            route.continue_()
+    
+    def _load_video_page(self, video_id):
+        """Navigate to the video page and dismiss the cookie consent"""
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        self.page.goto(url, wait_until="domcontentloaded")
+        try:
+            self.page.wait_for_selector("h1 yt-formatted-string", timeout=15000)
+        except PlaywrightTimeoutError:
+            print("Timed out waiting for video page to load")
+        
+        # Handle cookie consent if it appears
+        for button in self.page.query_selector_all(COOKIE_BUTTON_SELECTOR):
+            if any(word in button.inner_text().lower() for word in COOKIE_ACCEPT_WORDS):
+                button.click()
+                break
+        
+        self._loaded_video_id = video_id
+        return url
+    
+    def _get_text(self, selector, default=""):
+        """Helper to get text from an element or return default value"""
+        element = self.page.query_selector(selector)
+        return element.inner_text() if element else default
+    
+    def _scroll_to_comments(self):
+        """Scroll the page to the top of the comments section"""
+        self.page.evaluate("() => window.scrollTo(0, document.querySelector('#comments').offsetTop)")
+    
+    def _scroll_down(self):
+        """Scroll down two viewports to trigger loading more comments"""
+        self.page.evaluate("() => window.scrollBy(0, document.documentElement.clientHeight * 2)")
+    
+    def _wait_for_comment_count(self, last_count, timeout=3):
+        """Wait until more than last_count comments are rendered or the timeout elapses"""
+        try:
+            self.page.wait_for_function(
+                "n => document.querySelectorAll('ytd-comment-thread-renderer').length > n",
+                arg=last_count, timeout=timeout * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    
+    def _install_comment_observer(self):
+        """Count comment list mutations in the page so new loads can be detected"""
+        return self.page.evaluate(JS_INSTALL_OBSERVER)
+    
+    def _wait_for_new_comments(self, timeout=4):
+        """Wait until the comment observer reports newly added comments or the timeout elapses"""
+        try:
+            self.page.wait_for_function(f"({JS_TAKE_NEW_COMMENTS})() > 0", timeout=timeout * 1000)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    
+    def _sort_comments_by_newest(self):
+        """Sort YouTube comments by newest first"""
+        sort_button = self.page.query_selector(
+            "ytd-sort-filter-submenus-renderer yt-sort-filter-sub-menu-renderer")
+        if not sort_button:
+            return
+        
+        sort_button.click()
+        old_comment = self.page.query_selector("ytd-comment-thread-renderer")
+        try:
+            self.page.click(NEWEST_SORT_SELECTOR, timeout=15000)
+            if old_comment:
+                # Wait for the list to re-render in the new order
+                self.page.wait_for_function("el => !el.isConnected", arg=old_comment, timeout=15000)
+        except PlaywrightTimeoutError:
+            return
+        print("Changed sort order to: Newest first")
+    
+    def _extract_all_comments_js(self, last_seen_count):
+        """Extract data from all comment elements past last_seen_count in one script call"""
+        batch = self.page.evaluate(JS_BATCH_EXTRACT, last_seen_count)
+        return [Comment._make(row) for row in batch or []]
+    
+    def close(self):
+        """Close the browser"""
+        self.browser.close()
+        self._playwright.stop()
+        print("Browser closed")
+
+class BrowserPool:
+    MAX_USES = 50
+    
+    def __init__(self, size=4, use_edge=True):
+        """Start a pool of prewarmed browsers that are reused across videos"""
+        self.size = size
+        self.use_edge = use_edge
+        self._drivers = queue.Queue()
+        self._all_drivers = {}  # Every live driver, including checked out ones
+        self._uses = {}
+        self._slots = {}
+        self._live = 0  # Slots that still have a working driver
+        self._lock = threading.Lock()
+        self._closed = False
+        try:
+            for slot in range(size):
+                self._add_driver(slot)
+        except Exception:
+            # Don't leave already started browsers running if prewarming fails
+            self.close()
+            raise
+    
+    def _add_driver(self, slot):
+        """Start a new driver on the given profile slot and put it in the pool"""
+        driver = create_driver(self.use_edge, profile_slot=slot)
+        self._all_drivers[id(driver)] = driver
+        self._uses[id(driver)] = 0
+        self._slots[id(driver)] = slot
+        with self._lock:
+            self._live += 1
+        self._drivers.put(driver)
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a scraper backed by a pooled driver"""
+        driver = self._drivers.get()
+        if driver is None:
+            # Sentinel: the pool is closed or lost all its drivers, pass it on to the next waiter
+            self._drivers.put(None)
+            raise RuntimeError("Browser pool has no working browsers left")
+        try:
+            yield YouTubeScraper(driver=driver)
+        finally:
+            self.release(driver)
+    
+    def release(self, driver):
+        """Reset a driver and hand it back, recycling it after MAX_USES jobs (never raises)"""
+        if self._closed:
+            # Pool was closed while the driver was checked out, close() already quit it
+            return
+        
+        uses = self._uses.pop(id(driver)) + 1
+        slot = self._slots.pop(id(driver))
+        if uses < self.MAX_USES:
+            try:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                self._uses[id(driver)] = uses
+                self._slots[id(driver)] = slot
+                self._drivers.put(driver)
+                return
+            except Exception:  # A dead driver raises urllib3 errors, not only WebDriverException
+                pass
+        
+        # Driver is worn out or broken, replace it with a fresh one on the same profile
+        # (quit first so the profile lock is released)
+        self._all_drivers.pop(id(driver), None)
+        with self._lock:
+            self._live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        try:
+            self._add_driver(slot)
+        except Exception as e:
+            print(f"Could not restart browser for pool slot {slot}: {e}")
+            with self._lock:
+                if self._live == 0:
+                    # Wake up anyone waiting on a driver that will never come back
+                    self._drivers.put(None)
+    
+    def scrape_many(self, urls, job):
+        """Run job(scraper, url) for each URL in parallel, returning None for URLs that failed"""
+        def run(url):
+            # One bad URL or crashed browser must not abort the rest of the batch
+            try:
+                with self.acquire() as scraper:
+                    return job(scraper, url)
+            except Exception as e:
+                print(f"Failed to scrape {url}: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, urls))
+    
+    def close(self):
+        """Close every browser in the pool, including ones that are checked out"""
+        self._closed = True
+        for driver in self._all_drivers.values():
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._all_drivers.clear()
+        self._drivers.put(None)
+        self._uses.clear()
+        self._slots.clear()
+        print("Browser pool closed")
+
+def save_output(scraper, data, base_filename, output_format="json"):
+    """Save scraped data in the requested output format(s)"""
+    if output_format in ["json", "both"]:
+        scraper.save_to_json(data, f"{base_filename}.json")
+    
+    if output_format in ["csv", "both"]:
+        scraper.save_to_csv(data, f"{base_filename}.csv")
+
+def scrape_batch(urls, max_comments=None, sort_by="top", output_format="json", use_edge=True, max_workers=3):
+    """Scrape several videos in parallel, saving one output file per video"""
+    # Drop repeated videos, two workers on the same video would write the same output file
+    unique_urls = {}
+    for url in urls:
+        unique_urls.setdefault(YouTubeScraper.extract_video_id(url) or url, url)
+    urls = list(unique_urls.values())
+    
+    max_workers = max(1, min(max_workers, MAX_BATCH_WORKERS, len(urls)))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+    pool = BrowserPool(size=max_workers, use_edge=use_edge)
+    
+    def scrape_and_save(scraper, url):
+        base_filename = f"yt_comments_{scraper.extract_video_id(url) or 'video'}_{timestamp}"
+        stream_to = f"{base_filename}.ndjson" if output_format == "ndjson" else None
+        data = scraper.scrape_comments_api(url, max_comments, sort_by, stream_to)
+        if data:
+            save_output(scraper, data, base_filename, output_format)
+        return data
+    
+    try:
+        results = [r for r in pool.scrape_many(urls, scrape_and_save) if r]
+    finally:
+        pool.close()
+    
+    # Combine all comments into one table, tagged with their video
+    frames = [_comments_frame(r).assign(video_id=r["video_info"]["video_id"])
+              for r in results if r["metadata"]["total_comments_collected"]]
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return results, combined
+
+def _comments_frame(data):
+    """Build a DataFrame of all comments in a result, reading them back from the NDJSON file if streamed"""
+    if "streamed_to" not in data["metadata"]:
+        return pd.DataFrame(data["comments"])
+    
+    # The result only holds the latest comments, the last line of the file is the metadata trailer
+    with open(data["metadata"]["streamed_to"], encoding='utf-8') as f:
+        lines = f.readlines()
+    return pd.DataFrame([json.loads(line) for line in lines[:-1]], columns=Comment._fields)
+
 def main():
     # Get user input
     print("\n=== YouTube Comment Scraper ===\n")
     
-    video_url = input("Enter YouTube video URL: ")
+    video_urls = input("Enter YouTube video URL(s), separated by commas: ").replace(",", " ").split()
     max_comments = input("Enter maximum comments to scrape (press Enter for all): ")
     sort_option = input("Sort comments by (top/newest, default: top): ").lower() or "top"
-    output_format = input("Output format (csv/json/both, default: json): ").lower() or "json"
-    browser_choice = input("Browser (edge/chrome, default: edge): ").lower() or "edge"
+    output_format = input("Output format (csv/json/ndjson/both, default: json): ").lower() or "json"
+    browser_choice = input("Browser (edge/chrome/playwright, default: edge): ").lower() or "edge"
     
     # Process inputs
     max_comments = int(max_comments) if max_comments and max_comments.isdigit() else None
     use_edge = browser_choice != "chrome"
     
+    # Scrape several videos in parallel
+    if len(video_urls) > 1:
+        if browser_choice == "playwright":
+            print("Playwright only supports one video at a time, choose edge or chrome for multiple URLs")
+            return
+        results, combined = scrape_batch(video_urls, max_comments, sort_option, output_format, use_edge)
+        total = sum(r["metadata"]["total_comments_collected"] for r in results)
+        print(f"\nBatch complete! Collected {total} comments from {len(results)} videos")
+        return
+    
+    video_url = video_urls[0] if video_urls else ""
+    
     # Generate filenames
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
     
     # Run scraper
-    scraper = YouTubeScraper(use_edge=use_edge)
+    scraper = YouTubeScraperPW() if browser_choice == "playwright" else YouTubeScraper(use_edge=use_edge)
     
     try:
         # Get video ID for filename
         video_id = scraper.extract_video_id(video_url) or "video"
         base_filename = f"yt_comments_{video_id}_{timestamp}"
         
-        # Scrape comments
-        data = scraper.scrape_comments(video_url, max_comments, sort_option)
+        # Scrape comments, streaming them straight to disk for NDJSON output
+        stream_to = f"{base_filename}.ndjson" if output_format == "ndjson" else None
+        data = scraper.scrape_comments_api(video_url, max_comments, sort_option, stream_to)
         
         if data:
             # Save output files
-            if output_format in ["json", "both"]:
-                scraper.save_to_json(data, f"{base_filename}.json")
-            
-            if output_format in ["csv", "both"]:
-                scraper.save_to_csv(data, f"{base_filename}.csv")
+            save_output(scraper, data, base_filename, output_format)
             
-            print(f"\nScraping complete! Collected {len(data['comments'])} comments")
+            print(f"\nScraping complete! Collected {data['metadata']['total_comments_collected']} comments")
         else:
             print("Failed to scrape comments")
             